@@ -2,26 +2,61 @@
 Auth is a base object which passes through attributes such as the authentication token
 and base url to subsequent requests.
 """
+# Standard Library
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Union
+
 # Third Party
 import requests
 
 # First Party
 from netkit.helpers.api import netbox_api
+from netkit.helpers.identity import IdentityMap
 
 
-class Auth:
+class Auth:  # pylint: disable=too-many-instance-attributes
     """
     The Auth class is used to store various authentication parameters.
     An Auth object is required on all objects that interact with a NetBox instance API
 
     :param token: The authentication token
     :param url: The base url of the NetBox instance
+    :param connect_timeout: Seconds to wait for a connection to the instance
+    :param read_timeout: Seconds to wait between bytes received from the instance
+    :param deadline: Default total seconds a request may take, including any hedged request
+    :param hedge_percentile: When set, a GET which has not completed within this percentile of
+        recent GET latencies is sent a second time and the first response is used
     """
 
-    def __init__(self, token: str, url: str):
+    # Latencies recorded before a hedge threshold is calculated, and the number kept
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_MAX_SAMPLES = 200
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        token: str,
+        url: str,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        deadline: float = None,
+        hedge_percentile: float = None,
+    ):
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
         self._token = token
         self._url = url
         self._is_valid = False
+        self._identity_map = IdentityMap()
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._deadline = deadline
+        self._hedge_percentile = hedge_percentile
+        self._latencies = deque(maxlen=self.HEDGE_MAX_SAMPLES)
+        self._executor = None
+        self._request_stats = {'requests': 0, 'timeouts': 0, 'hedges': 0, 'hedge_wins': 0}
+        self._stats_lock = threading.Lock()
 
     def __repr__(self):
         attrs = {
@@ -51,6 +86,79 @@ class Auth:
         """
         return self._url or None
 
+    @property
+    def identity_map(self) -> IdentityMap:
+        """
+        The :class:`netkit.helpers.identity.IdentityMap` shared by objects using this Auth
+
+        """
+        return self._identity_map
+
+    @property
+    def timeout(self) -> Tuple[Union[float, None], Union[float, None]]:
+        """
+        The connect and read timeouts passed to each request
+
+        """
+        return (self._connect_timeout, self._read_timeout)
+
+    @property
+    def deadline(self) -> Union[float, None]:
+        """
+        The default total seconds a request may take
+
+        """
+        return self._deadline
+
+    @property
+    def hedge_delay(self) -> Union[float, None]:
+        """
+        Seconds after which an unfinished GET is hedged, or None when hedging is disabled or
+        too few latencies have been recorded
+
+        """
+        if self._hedge_percentile is None or len(self._latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[int(self._hedge_percentile / 100 * (len(latencies) - 1))]
+
+    @property
+    def request_stats(self) -> Dict[str, int]:
+        """
+        Counters of requests sent, requests which timed out, hedged requests sent and hedged
+        requests which answered before the original
+
+        """
+        with self._stats_lock:
+            return dict(self._request_stats)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The thread pool used to run requests with a deadline or hedge
+
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix='netkit')
+        return self._executor
+
+    def record_latency(self, seconds: float):
+        """
+        Records the latency of a successful GET, used to calculate the hedge threshold
+
+        :param seconds: The time taken by the request
+        """
+        self._latencies.append(seconds)
+
+    def increment_stat(self, counter: str):
+        """
+        Increments one of the :attr:`request_stats` counters
+
+        :param counter: The name of the counter
+        """
+        with self._stats_lock:
+            self._request_stats[counter] += 1
+
     def is_valid(self) -> bool:
         """
         Attempts to establish a connection to the Netbox instance to verify the token provided
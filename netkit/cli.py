@@ -0,0 +1,184 @@
+"""
+The netkit command line interface. Exports inventory from a NetBox instance as NDJSON or CSV,
+streaming one page at a time so memory use stays constant regardless of the inventory size
+"""
+# Standard Library
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import nullcontext
+from typing import Iterator, List, TextIO
+
+# First Party
+from netkit import VERSION
+from netkit.auth import Auth
+from netkit.helpers import profiling
+from netkit.helpers.exceptions import NetkitError
+from netkit.organization.regions import Regions
+from netkit.organization.sites import Sites
+
+EXPORTERS = {
+    'sites': lambda auth, **kwargs: Sites(auth).iter_sites(**kwargs),
+    'regions': lambda auth, **kwargs: Regions(auth).iter_regions(**kwargs),
+}
+
+
+def _parse_filters(filters: List[str]) -> dict:
+    """
+    Converts ``key=value`` arguments into query parameters. Repeated keys are sent as a list
+    """
+    params = {}
+    for item in filters or []:
+        key, separator, value = item.partition('=')
+        if not separator or not key:
+            raise NetkitError(message=f"Filters must be given as key=value, not {item!r}")
+        params.setdefault(key, []).append(value)
+    return {key: value[0] if len(value) == 1 else value for key, value in params.items()}
+
+
+def _select(record: dict, fields: List[str]) -> dict:
+    """
+    Returns the requested fields of a record. Nested values are selected with a dotted
+    name, such as ``region.slug``
+    """
+    if not fields:
+        return record
+    selected = {}
+    for field in fields:
+        value = record
+        for key in field.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        selected[field] = value
+    return selected
+
+
+def _csv_value(value):
+    """
+    Flattens a value so that it can be written to a single CSV cell
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+
+def write_ndjson(records: Iterator[dict], stream: TextIO) -> int:
+    """
+    Writes each record as a single line of JSON
+
+    :param records: The records to write
+    :param stream: The file-like object the records are written to
+    """
+    count = 0
+    for count, record in enumerate(records, start=1):
+        stream.write(json.dumps(record, separators=(',', ':')))
+        stream.write('\n')
+    return count
+
+
+def write_csv(records: Iterator[dict], stream: TextIO, fields: List[str] = None) -> int:
+    """
+    Writes the records as CSV. The header is taken from ``fields`` when given, otherwise
+    from the keys of the first record
+
+    :param records: The records to write
+    :param stream: The file-like object the records are written to
+    :param fields: The columns to write
+    """
+    writer = None
+    count = 0
+    for count, record in enumerate(records, start=1):
+        if writer is None:
+            writer = csv.DictWriter(
+                stream, fieldnames=fields or list(record), extrasaction='ignore'
+            )
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in record.items()})
+    return count
+
+
+def export(args: argparse.Namespace, stream: TextIO) -> int:
+    """
+    Streams the requested object type to ``stream`` in the requested format
+    """
+    if not args.url or not args.token:
+        raise NetkitError(message="A NetBox url and token are required, see --url and --token")
+    auth = Auth(token=args.token, url=args.url)
+    objects = EXPORTERS[args.object](
+        auth, page_size=args.page_size, params=_parse_filters(args.filter)
+    )
+    fields = [field for field in (args.fields or '').split(',') if field]
+    records = (_select(item.as_json(), fields) for item in objects)
+    if args.format == 'csv':
+        return write_csv(records, stream, fields=fields)
+    return write_ndjson(records, stream)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the ``netkit`` command
+    """
+    parser = argparse.ArgumentParser(prog='netkit', description=__doc__)
+    parser.add_argument('--version', action='version', version=f'%(prog)s {VERSION}')
+    parser.add_argument(
+        '--url', default=os.environ.get('NETKIT_URL'), help="Base url (env: NETKIT_URL)"
+    )
+    parser.add_argument(
+        '--token', default=os.environ.get('NETKIT_TOKEN'), help="API token (env: NETKIT_TOKEN)"
+    )
+    parser.add_argument(
+        '--profile', action='store_true', help="Print a timing breakdown to stderr on completion"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Export objects as NDJSON or CSV")
+    export_parser.add_argument('object', choices=sorted(EXPORTERS))
+    export_parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    export_parser.add_argument(
+        '-o', '--output', default='-', help="File to write to, defaults to stdout"
+    )
+    export_parser.add_argument(
+        '--fields', help="Comma separated fields to export, such as id,name,region.slug"
+    )
+    export_parser.add_argument(
+        '--filter',
+        action='append',
+        metavar='KEY=VALUE',
+        help="A NetBox filter, may be given more than once",
+    )
+    export_parser.add_argument(
+        '--page-size', type=int, default=None, help="Objects requested per page"
+    )
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point for the ``netkit`` console script
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        with profiling.profile(stream=sys.stderr) if args.profile else nullcontext():
+            with profiling.operation(f'export {args.object}'):
+                if args.output == '-':
+                    export(args, sys.stdout)
+                    sys.stdout.flush()
+                else:
+                    with open(args.output, 'w', newline='', encoding='utf-8') as stream:
+                        export(args, stream)
+    except BrokenPipeError:
+        # The reader, such as head, has gone away. Point stdout at devnull so that the flush
+        # at interpreter exit does not raise again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except Exception as error:  # pylint: disable=broad-except
+        print(f"netkit: {getattr(error, 'message', error)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Watcher polls the NetBox object change log and applies creates, updates and deletes to
+tracked :class:`netkit.organization.sites.Sites` and :class:`netkit.organization.regions.Regions`
+objects, so their state stays current without re-requesting every object
+"""
+# Standard Library
+import logging
+import threading
+from itertools import islice
+from typing import Callable, Dict, List
+
+# First Party
+from netkit.auth import Auth
+from netkit.helpers.api import netbox_results, netbox_results_by_id
+
+LOGGER = logging.getLogger(__name__)
+
+# NetBox releases before 2.10 report the change action as an integer
+ACTIONS = {1: 'create', 2: 'update', 3: 'delete'}
+
+# Change log ids below the cursor which are requested again on every poll, as concurrent
+# requests to NetBox may commit their changes in a different order to their ids
+CURSOR_OVERLAP = 100
+
+
+class Watcher:
+    """
+    Polls ``/api/extras/object-changes/`` for changes to tracked object types. Only the
+    objects which changed are requested, so the cost of each poll follows the rate of change
+    rather than the size of the inventory
+
+    :param auth: Auth object used for authenting to the API
+    :param interval: Seconds between polls when running in the background
+    """
+
+    def __init__(self, auth: Auth, interval: float = 30.0):
+        self._auth = auth
+        self._interval = interval
+        self._tracked = {}
+        self._subscribers = []
+        # The change log cursor of each object type, and the ids applied near it
+        self._positions = {}
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+            "tracked": sorted(self._tracked),
+            "running": self.running,
+        }
+        return "<{cls}: (at {at}) tracked={tracked!r} running={running!r}>".format(**attrs)
+
+    @property
+    def auth(self) -> Auth:
+        """
+        The :class:`netkit.auth.Auth` object used to authenticate to the instance
+        """
+        return self._auth
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the watcher is polling in the background
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def track(self, collection, object_type: str, endpoint: str):
+        """
+        Applies changes of an object type to a collection, such as a
+        :class:`netkit.organization.sites.Sites` object. The next poll records the position of
+        the change log for the object type, and later polls apply changes logged after it
+
+        :param collection: The object whose ``apply_changes`` method receives the changes
+        :param object_type: The NetBox content type, such as ``dcim.site``
+        :param endpoint: The NetBox API list endpoint of the object type
+        """
+        self._tracked[object_type] = (collection, endpoint)
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """
+        Registers a callback which is called with each change once it has been applied. A
+        change is a dictionary holding the ``action``, ``type``, ``id`` and ``object``, where
+        ``object`` is None for deletes. Exceptions raised by a callback are logged and do not
+        stop other callbacks being notified
+
+        :param callback: The function to call
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        """
+        Removes a callback registered with :meth:`subscribe`
+
+        :param callback: The function to remove
+        """
+        self._subscribers.remove(callback)
+
+    def poll(self) -> List[Dict]:
+        """
+        Applies every change logged since the previous poll and returns them. Each object type
+        keeps its own position in the change log, as changes to one type may be logged while
+        another is being requested. The first poll of an object type only records its
+        position, as its collection is expected to be loaded afterwards.
+
+        The last :data:`CURSOR_OVERLAP` ids before the position are requested again and any
+        change not applied yet is applied, so a change committed after changes with higher
+        ids is still applied once, provided fewer than :data:`CURSOR_OVERLAP` changes were
+        logged between its id and the position at the time. A change committed later than
+        that is missed until the collection is loaded again
+        """
+        changes = []
+        for object_type, (collection, endpoint) in list(self._tracked.items()):
+            if object_type not in self._positions:
+                params = {'changed_object_type': object_type, 'limit': CURSOR_OVERLAP}
+                recent = islice(
+                    netbox_results(self._auth, "/api/extras/object-changes/", params),
+                    CURSOR_OVERLAP,
+                )
+                # Changes logged before the collection is loaded are already reflected in it
+                applied = {change['id'] for change in recent}
+                self._positions[object_type] = (max(applied, default=0), applied)
+                continue
+            cursor, applied = self._positions[object_type]
+            params = {
+                'changed_object_type': object_type,
+                'id__gt': max(cursor - CURSOR_OVERLAP, 0),
+            }
+            logged = [
+                change
+                for change in netbox_results(self._auth, "/api/extras/object-changes/", params)
+                if change['id'] not in applied
+            ]
+            if not logged:
+                continue
+            changes.extend(self._apply(collection, object_type, endpoint, logged))
+            cursor = max([cursor] + [change['id'] for change in logged])
+            # Only ids which are requested again need remembering
+            applied = {
+                change_id
+                for change_id in applied | {change['id'] for change in logged}
+                if change_id > cursor - CURSOR_OVERLAP
+            }
+            self._positions[object_type] = (cursor, applied)
+
+        for change in changes:
+            for callback in list(self._subscribers):
+                try:
+                    callback(change)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception("Watcher subscriber %r failed on %r", callback, change)
+        return changes
+
+    def _apply(self, collection, object_type: str, endpoint: str, logged: List[dict]):
+        # Only the last action logged for each object matters
+        actions = {}
+        for change in sorted(logged, key=lambda change: change['id']):
+            action = change['action']
+            action = action.get('value') if isinstance(action, dict) else action
+            actions[change['changed_object_id']] = ACTIONS.get(action, action)
+
+        changed = [obj_id for obj_id, action in actions.items() if action != 'delete']
+        updated = {obj['id']: obj for obj in netbox_results_by_id(self._auth, endpoint, changed)}
+        # An object changed and then deleted since the last poll is no longer returned
+        deleted = [obj_id for obj_id in actions if obj_id not in updated]
+        collection.apply_changes(list(updated.values()), deleted)
+
+        return [
+            {
+                'action': action if obj_id in updated else 'delete',
+                'type': object_type,
+                'id': obj_id,
+                'object': updated.get(obj_id),
+            }
+            for obj_id, action in actions.items()
+        ]
+
+    def start(self):
+        """
+        Starts polling in a background thread every ``interval`` seconds. Errors raised while
+        requesting or applying changes are logged and the next poll retries from the same
+        position. Errors raised by subscribers are logged without affecting the position
+        """
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='netkit-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stops the background thread started by :meth:`start`
+
+        :param timeout: Seconds to wait for an in-progress poll to finish
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Failed to poll the NetBox change log")
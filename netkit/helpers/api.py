@@ -1,19 +1,40 @@
 """
 Helper to interact with the NetBox API
 """
+# Standard Library
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, Union
+from urllib.parse import urlsplit
+
 # Third Party
 import requests
 
+# First Party
+from netkit.helpers import profiling
+from netkit.helpers.exceptions import NetkitTimeoutError
+
+# The most IDs sent in one id__in filter, keeping request URLs well under common limits
+ID_CHUNK_SIZE = 200
+
 
-def netbox_api(
-    auth: 'Auth', path: str, payload: dict = None, method: str = "GET"
+def netbox_api(  # pylint: disable=too-many-arguments
+    auth: 'Auth',
+    path: str,
+    payload: dict = None,
+    method: str = "GET",
+    params: dict = None,
+    deadline: float = None,
 ) -> requests.Response:
     """
     :param auth: Auth object to use for authentication to the API
     :param path: The NetBox API endpoint to use
     :param payload: The data sent to the API
     :param method: The request type
-    :raises Exception: Catches all exceptions
+    :param params: Query string parameters, such as filters, sent with the request
+    :param deadline: Total seconds the request may take, defaulting to the deadline of ``auth``
+    :raises NetkitTimeoutError: When the request times out or the deadline passes
+    :raises Exception: Catches all other exceptions
     """
     headers = {
         "Accept": "application/json",
@@ -22,10 +43,169 @@ def netbox_api(
     }
     if method not in ["GET", "POST", "PUT"]:
         raise ValueError("Method must be either GET, POST or PUT")
-    try:
-        url = auth.url + path
-        response = requests.request(method, url, json=payload, headers=headers)
+    if deadline is None:
+        deadline = auth.deadline
+    expires = time.monotonic() + deadline if deadline is not None else None
+    hedge_delay = auth.hedge_delay if method == "GET" else None
+    label = profiling.current_operation() or _label(method, path)
+
+    def send() -> requests.Response:
+        timeout = auth.timeout
+        if expires is not None:
+            remaining = max(expires - time.monotonic(), 0.001)
+            timeout = tuple(min(limit or remaining, remaining) for limit in timeout)
+        auth.increment_stat('requests')
+        started = time.monotonic()
+        response = requests.request(
+            method, auth.url + path, json=payload, headers=headers, params=params, timeout=timeout
+        )
+        if profiling.enabled():
+            # Elapsed covers connecting until the headers are parsed, the rest is the body
+            waited = response.elapsed.total_seconds()
+            profiling.record('connect', waited, label)
+            profiling.record('transfer', max(time.monotonic() - started - waited, 0), label)
         response.raise_for_status()
+        if method == "GET":
+            auth.record_latency(time.monotonic() - started)
         return response
+
+    try:
+        if expires is None and hedge_delay is None:
+            return send()
+        return _send_hedged(auth, send, expires, hedge_delay)
+    except NetkitTimeoutError:
+        auth.increment_stat('timeouts')
+        raise
+    except requests.Timeout as error:
+        auth.increment_stat('timeouts')
+        raise NetkitTimeoutError(
+            message=f"Timed out waiting for the NetBox API: {error}"
+        ) from error
     except Exception as error:
         raise Exception(f"Invalid response received from NetBox API when retrieving data: {error}")
+
+
+def _send_hedged(
+    auth: 'Auth',
+    send: Callable[[], requests.Response],
+    expires: Union[float, None],
+    hedge_delay: Union[float, None],
+) -> requests.Response:
+    """
+    Runs ``send`` on the executor of ``auth`` so that the deadline can be enforced. When a hedge
+    delay is given and the request is still running after it, a duplicate request is sent and
+    the first successful response is returned
+    """
+
+    def remaining() -> Union[float, None]:
+        return None if expires is None else max(expires - time.monotonic(), 0)
+
+    original = auth.executor.submit(send)
+    pending = {original}
+    if hedge_delay is not None:
+        limit = remaining()
+        done, pending = wait(
+            pending, timeout=hedge_delay if limit is None else min(hedge_delay, limit)
+        )
+        if not done and remaining() != 0:
+            auth.increment_stat('hedges')
+            pending.add(auth.executor.submit(send))
+        pending |= done
+    error = None
+    while pending:
+        done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                if future is not original:
+                    auth.increment_stat('hedge_wins')
+                for loser in pending:
+                    loser.cancel()
+                return future.result()
+            error = future.exception()
+    if error is not None and not pending:
+        raise error
+    raise NetkitTimeoutError(message="The deadline passed before the NetBox API responded")
+
+
+def netbox_json(response: requests.Response, label: str = None):
+    """
+    Decodes the JSON body of a response, recording the time taken when profiling
+
+    :param response: The response returned by :func:`netbox_api`
+    :param label: The operation recorded when none is running, defaulting to the method and
+        path of the request
+    """
+    if not profiling.enabled():
+        return response.json()
+    label = label or _label(response.request.method, response.request.path_url)
+    with profiling.timed('decode', label):
+        return response.json()
+
+
+def netbox_results(
+    auth: 'Auth', path: str, params: dict = None, deadline: float = None
+) -> Iterator[dict]:
+    """
+    Yields every object from a paginated NetBox list endpoint. Pages are requested one at a
+    time by following the ``next`` link, so only a single page is held in memory.
+
+    :param auth: Auth object to use for authentication to the API
+    :param path: The NetBox API list endpoint to use
+    :param params: Query string parameters, such as filters, sent with the first request
+    :param deadline: Total seconds allowed for requesting every page, defaulting to the
+        deadline of ``auth`` for each page
+    """
+    expires = time.monotonic() + deadline if deadline is not None else None
+    while path:
+        remaining = max(expires - time.monotonic(), 0) if expires is not None else None
+        response = netbox_api(auth, path, params=params, deadline=remaining)
+        page = netbox_json(response, _label("GET", path))
+        yield from page.get('results') or []
+        path = _next_path(auth, page.get('next'))
+        # The next link already carries the query string of the original request
+        params = None
+
+
+def netbox_results_by_id(
+    auth: 'Auth', path: str, ids: Iterable[int], chunk_size: int = ID_CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    Yields the objects with the given IDs using ``id__in`` filters. The IDs are sent in chunks
+    so the request URL stays short enough for proxies and NetBox to accept
+
+    :param auth: Auth object to use for authentication to the API
+    :param path: The NetBox API list endpoint to use
+    :param ids: The IDs of the objects to request
+    :param chunk_size: The most IDs sent in a single request
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        params = {'id__in': ','.join(str(obj_id) for obj_id in chunk), 'limit': len(chunk)}
+        yield from netbox_results(auth, path, params=params)
+
+
+def _label(method: str, path: str) -> str:
+    """
+    The operation recorded for a request made outside a named operation. The query string is
+    left out so every page of a list is recorded together
+    """
+    return f"{method} {urlsplit(path).path}"
+
+
+def _next_path(auth: 'Auth', next_url: Union[str, None]) -> Union[str, None]:
+    """
+    Converts the absolute ``next`` link returned by NetBox into a path relative to the base url
+    """
+    if not next_url:
+        return None
+    split = urlsplit(next_url)
+    base_path = urlsplit(auth.url).path.rstrip('/')
+    path = split.path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path) :]
+    if split.query:
+        path = f"{path}?{split.query}"
+    return path
@@ -34,3 +34,9 @@ class NetkitError(Exception):
         The error represented as a JSON dictionary
         """
         return {"error": True, "message": self.message}
+
+
+class NetkitTimeoutError(NetkitError):
+    """ Raised when a request does not complete within its timeout or deadline
+    :param message: A defined error message placed within the exception
+    """
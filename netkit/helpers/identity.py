@@ -0,0 +1,89 @@
+"""
+An identity map which holds a single instance of each object fetched from NetBox, so related
+objects shared by many others are only requested once
+"""
+# Standard Library
+from typing import Dict, Iterable, List
+
+# First Party
+from netkit.helpers.api import netbox_results_by_id
+
+
+class IdentityMap:
+    """
+    Stores wrapped NetBox objects keyed on their class and ID
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+            "size": len(self),
+        }
+        return "<{cls}: (at {at}) size={size!r}>".format(**attrs)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, kind: type, obj_id: int):
+        """
+        Returns the stored object of type ``kind`` with the given ID, or None
+
+        :param kind: The wrapper class of the object, such as ``RegionInfo``
+        :param obj_id: The ID of the object
+        """
+        return self._objects.get((kind, obj_id))
+
+    def add(self, obj):
+        """
+        Stores an object, replacing any previous instance with the same ID
+
+        :param obj: The wrapped object to store
+        """
+        self._objects[(type(obj), obj.id)] = obj
+        return obj
+
+    def discard(self, kind: type, obj_id: int):
+        """
+        Removes an object from the map, if it is present
+
+        :param kind: The wrapper class of the object
+        :param obj_id: The ID of the object
+        """
+        self._objects.pop((kind, obj_id), None)
+
+    def missing(self, kind: type, ids: Iterable[int]) -> List[int]:
+        """
+        Returns the IDs, in order and without duplicates, which are not yet stored
+
+        :param kind: The wrapper class of the objects
+        :param ids: The IDs to check
+        """
+        return [obj_id for obj_id in dict.fromkeys(ids) if (kind, obj_id) not in self._objects]
+
+    def clear(self):
+        """
+        Removes every stored object
+        """
+        self._objects.clear()
+
+
+def resolve_related(auth: 'Auth', kind: type, path: str, ids: Iterable[int]) -> Dict[int, object]:
+    """
+    Returns the objects with the given IDs, fetching any not already held in the identity map
+    of ``auth`` with ``id__in`` requests
+
+    :param auth: Auth object to use for authentication to the API
+    :param kind: The wrapper class of the objects, such as ``RegionInfo``
+    :param path: The NetBox API list endpoint of the objects
+    :param ids: The IDs of the objects to resolve
+    """
+    identity_map = auth.identity_map
+    ids = [obj_id for obj_id in dict.fromkeys(ids) if obj_id is not None]
+    missing = identity_map.missing(kind, ids)
+    for attributes in netbox_results_by_id(auth, path, missing):
+        identity_map.add(kind(attributes))
+    return {obj_id: identity_map.get(kind, obj_id) for obj_id in ids}
@@ -0,0 +1,215 @@
+"""
+An opt-in profiler which records how long each netkit operation spends in each phase: waiting
+for the connection and response headers, transferring the body, decoding JSON, wrapping
+results in objects and converting field values.
+
+Profiling is enabled with the :func:`profile` context manager, or for the whole process by
+setting the ``NETKIT_PROFILE`` environment variable, which prints a report to stderr on exit
+"""
+# Standard Library
+import atexit
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, TextIO, Tuple
+
+PHASES = ('connect', 'transfer', 'decode', 'wrap', 'conversion')
+
+# Profiles currently recording, shared by every thread
+_PROFILES = []
+_LOCAL = threading.local()
+
+
+class Profile:
+    """
+    Phase timings recorded while profiling was enabled
+    """
+
+    def __init__(self):
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+            "operations": len({name for name, _ in self._timings}),
+        }
+        return "<{cls}: (at {at}) operations={operations!r}>".format(**attrs)
+
+    @property
+    def timings(self) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        """
+        The number of calls and total seconds, keyed on the operation and phase
+        """
+        with self._lock:
+            return {key: tuple(value) for key, value in self._timings.items()}
+
+    def record(self, name: str, phase: str, seconds: float):
+        """
+        Adds a timing to the profile
+
+        :param name: The netkit operation, such as ``list_sites``
+        :param phase: The phase of the operation, one of :data:`PHASES`
+        :param seconds: The time spent
+        """
+        with self._lock:
+            timing = self._timings.setdefault((name, phase), [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+
+    def report(self) -> str:
+        """
+        The timings formatted as a table, grouped by operation
+        """
+        order = {phase: position for position, phase in enumerate(PHASES)}
+        timings = sorted(
+            self.timings.items(), key=lambda item: (item[0][0], order.get(item[0][1], len(order)))
+        )
+        width = max([len('operation')] + [len(name) for (name, _), _ in timings])
+        lines = [f"{'operation':<{width}}  {'phase':<10}  {'calls':>7}  {'total ms':>10}"]
+        for (name, phase), (calls, seconds) in timings:
+            lines.append(f"{name:<{width}}  {phase:<10}  {calls:>7}  {seconds * 1000:>10.3f}")
+        return '\n'.join(lines)
+
+
+class _Timer:
+    """
+    Times a block and records it in every active profile
+    """
+
+    __slots__ = ('_phase', '_fallback', '_started')
+
+    def __init__(self, phase: str, fallback: str):
+        self._phase = phase
+        self._fallback = fallback
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self._phase, time.perf_counter() - self._started, self._fallback)
+        return False
+
+
+class _NullTimer:
+    """
+    Returned by :func:`timed` when profiling is disabled, so timing costs almost nothing
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+_EXHAUSTED = object()
+
+
+def enabled() -> bool:
+    """
+    Whether any profile is recording
+    """
+    return bool(_PROFILES)
+
+
+def current_operation() -> str:
+    """
+    The name of the outermost operation running in this thread, or None
+    """
+    return getattr(_LOCAL, 'operation', None)
+
+
+def record(phase: str, seconds: float, fallback: str = None):
+    """
+    Records a timing in every active profile
+
+    :param phase: The phase of the operation, one of :data:`PHASES`
+    :param seconds: The time spent
+    :param fallback: The operation used when none is running in this thread
+    """
+    name = current_operation() or fallback or 'unknown'
+    for active in list(_PROFILES):
+        active.record(name, phase, seconds)
+
+
+def timed(phase: str, fallback: str = None):
+    """
+    A context manager which records the time spent in a block as ``phase``
+
+    :param phase: The phase of the operation, one of :data:`PHASES`
+    :param fallback: The operation used when none is running in this thread
+    """
+    if not _PROFILES:
+        return _NULL_TIMER
+    return _Timer(phase, fallback)
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """
+    Names the netkit operation that phases recorded in this thread belong to. May be used as a
+    context manager or decorator. Nested operations are recorded under the outermost name
+
+    :param name: The name of the operation, such as ``list_sites``
+    """
+    outermost = current_operation() is None
+    if outermost:
+        _LOCAL.operation = name
+    try:
+        yield
+    finally:
+        if outermost:
+            _LOCAL.operation = None
+
+
+def iterate(name: str, iterable: Iterable) -> Iterator:
+    """
+    Yields from ``iterable``, recording the work done to produce each item under the operation
+    ``name``. The operation is not left running while the caller handles each item
+
+    :param name: The name of the operation, such as ``iter_sites``
+    :param iterable: The items to yield, such as a generator requesting pages
+    """
+    iterator = iter(iterable)
+    while True:
+        with operation(name):
+            item = next(iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            return
+        yield item
+
+
+@contextmanager
+def profile(stream: TextIO = None) -> Iterator[Profile]:
+    """
+    Records phase timings of every netkit operation run within the block
+
+    :param stream: When given, the report is written here as the block exits
+    """
+    active = Profile()
+    _PROFILES.append(active)
+    try:
+        yield active
+    finally:
+        _PROFILES.remove(active)
+        if stream is not None:
+            stream.write(active.report() + '\n')
+
+
+def _profile_process():
+    active = Profile()
+    _PROFILES.append(active)
+    atexit.register(lambda: sys.stderr.write(active.report() + '\n'))
+
+
+if os.environ.get('NETKIT_PROFILE', '') not in ('', '0'):
+    _profile_process()
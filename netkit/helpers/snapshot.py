@@ -0,0 +1,276 @@
+"""
+Compact binary snapshots of NetBox objects which can be memory-mapped and shared read-only
+between processes. Integer fields are stored as fixed width columns, every other field as an
+index into a table of interned JSON strings, so rows are read directly from the mapping
+"""
+# Standard Library
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Iterable, Iterator, List, Tuple
+
+# First Party
+from netkit.helpers.api import netbox_api, netbox_json, netbox_results
+from netkit.helpers.exceptions import NetkitError
+
+MAGIC = b'NETKIT\x00\x01'
+INT_FORMAT = struct.Struct('<q')
+INDEX_FORMAT = struct.Struct('<I')
+LENGTH_FORMAT = struct.Struct('<I')
+NULL_INT = -(2**63)
+NULL_INDEX = 2**32 - 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and NULL_INT < value < -NULL_INT
+
+
+def _encode(records: List[dict]) -> Tuple[List[Tuple[str, str, bytes]], int, bytes]:
+    """
+    Encodes records as a list of ``(name, type, data)`` columns, plus the number of interned
+    strings and the encoded string table
+    """
+    names = list(dict.fromkeys(key for record in records for key in record))
+    strings = {}
+    columns = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        if all(value is None or _is_int(value) for value in values):
+            data = b''.join(
+                INT_FORMAT.pack(NULL_INT if value is None else value) for value in values
+            )
+            columns.append((name, 'int', data))
+            continue
+        indexes = []
+        for value in values:
+            if value is None:
+                indexes.append(NULL_INDEX)
+                continue
+            text = json.dumps(value, separators=(',', ':'), sort_keys=True)
+            indexes.append(strings.setdefault(text, len(strings)))
+        columns.append((name, 'json', b''.join(INDEX_FORMAT.pack(index) for index in indexes)))
+
+    return columns, len(strings), _string_table(strings)
+
+
+def _string_table(strings: Iterable[str]) -> bytes:
+    """
+    Encodes interned strings as ``count + 1`` offsets followed by the UTF-8 data
+    """
+    encoded = [text.encode('utf-8') for text in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return b''.join(INDEX_FORMAT.pack(offset) for offset in offsets) + b''.join(encoded)
+
+
+def write_snapshot(  # pylint: disable=too-many-locals
+    path: str, records: List[dict], metadata: dict = None
+) -> int:
+    """
+    Writes records to a snapshot file. The file is written alongside ``path`` and moved into
+    place, so processes which already have the previous snapshot mapped are unaffected
+
+    :param path: The file to write
+    :param records: The JSON dictionaries to store
+    :param metadata: Any JSON serialisable data stored in the header, such as server state
+    """
+    columns, string_count, string_table = _encode(records)
+
+    # Offsets are relative to the first aligned byte after the header
+    header = {
+        'rows': len(records),
+        'columns': [],
+        'strings': {'count': string_count},
+        'metadata': metadata or {},
+    }
+    offset = 0
+    for name, kind, data in columns:
+        header['columns'].append({'name': name, 'type': kind, 'offset': offset})
+        offset = _align(offset + len(data))
+    header['strings']['offset'] = offset
+    header_bytes = json.dumps(header).encode('utf-8')
+    start = _align(len(MAGIC) + LENGTH_FORMAT.size + len(header_bytes))
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as snapshot:
+            snapshot.write(MAGIC + LENGTH_FORMAT.pack(len(header_bytes)) + header_bytes)
+            for column, (_, _, data) in zip(header['columns'], columns):
+                snapshot.write(b'\x00' * (start + column['offset'] - snapshot.tell()))
+                snapshot.write(data)
+            snapshot.write(b'\x00' * (start + header['strings']['offset'] - snapshot.tell()))
+            snapshot.write(string_table)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(records)
+
+
+class Snapshot:
+    """
+    A read-only, memory-mapped snapshot file. Rows are returned as
+    :class:`netkit.helpers.snapshot.SnapshotRow` views which decode fields on access
+
+    :param path: The snapshot file to open
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, 'rb') as snapshot:
+            self._mapping = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mapping[: len(MAGIC)] != MAGIC:
+            self._mapping.close()
+            raise NetkitError(message=f"{path} is not a netkit snapshot")
+        (header_size,) = LENGTH_FORMAT.unpack_from(self._mapping, len(MAGIC))
+        start = len(MAGIC) + LENGTH_FORMAT.size
+        header = json.loads(self._mapping[start : start + header_size].decode('utf-8'))
+        data_start = _align(start + header_size)
+        self._rows = header['rows']
+        self._columns = {
+            column['name']: (column['type'] == 'int', data_start + column['offset'])
+            for column in header['columns']
+        }
+        self._strings = data_start + header['strings']['offset']
+        self._blob = self._strings + (header['strings']['count'] + 1) * INDEX_FORMAT.size
+        self._metadata = header['metadata']
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+            "path": self._path,
+            "rows": self._rows,
+        }
+        return "<{cls}: (at {at}) path={path!r} rows={rows!r}>".format(**attrs)
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, row: int) -> 'SnapshotRow':
+        if row < 0:
+            row += self._rows
+        if not 0 <= row < self._rows:
+            raise IndexError("snapshot row out of range")
+        return SnapshotRow(self, row)
+
+    def __iter__(self) -> Iterator['SnapshotRow']:
+        for row in range(self._rows):
+            yield SnapshotRow(self, row)
+
+    @property
+    def path(self) -> str:
+        """
+        The path of the snapshot file
+        """
+        return self._path
+
+    @property
+    def metadata(self) -> dict:
+        """
+        The metadata stored when the snapshot was written
+        """
+        return self._metadata
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The names of the fields stored in the snapshot
+        """
+        return list(self._columns)
+
+    def value(self, row: int, name: str):
+        """
+        Reads a single field of a row from the mapping
+
+        :param row: The row number
+        :param name: The name of the field
+        :raises KeyError: When the field is not stored in the snapshot
+        """
+        is_int, offset = self._columns[name]
+        if is_int:
+            (value,) = INT_FORMAT.unpack_from(self._mapping, offset + row * INT_FORMAT.size)
+            return None if value == NULL_INT else value
+        (index,) = INDEX_FORMAT.unpack_from(self._mapping, offset + row * INDEX_FORMAT.size)
+        if index == NULL_INDEX:
+            return None
+        start, end = struct.unpack_from('<II', self._mapping, self._strings + index * 4)
+        return json.loads(self._mapping[self._blob + start : self._blob + end].decode('utf-8'))
+
+    def close(self):
+        """
+        Unmaps the snapshot file. Rows must not be used afterwards
+        """
+        self._mapping.close()
+
+
+class SnapshotRow(Mapping):
+    """
+    A read-only dictionary view of one row in a :class:`netkit.helpers.snapshot.Snapshot`
+    """
+
+    __slots__ = ('_snapshot', '_row')
+
+    def __init__(self, snapshot: Snapshot, row: int):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, name: str):
+        return self._snapshot.value(self._row, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.columns)
+
+    def __len__(self):
+        return len(self._snapshot.columns)
+
+
+def dump_endpoint(auth: 'Auth', endpoint: str, path: str) -> int:
+    """
+    Writes every object of a NetBox list endpoint to a snapshot file, recording the server
+    state needed by :func:`is_fresh`
+
+    :param auth: Auth object to use for authentication to the API
+    :param endpoint: The NetBox API list endpoint to snapshot
+    :param path: The file to write
+    """
+    records = list(netbox_results(auth, endpoint))
+    updated = [record['last_updated'] for record in records if record.get('last_updated')]
+    last_updated = max(updated) if updated else None
+    metadata = {
+        'endpoint': endpoint,
+        'count': len(records),
+        'last_updated': last_updated,
+        'at_last_updated': updated.count(last_updated),
+    }
+    return write_snapshot(path, records, metadata)
+
+
+def is_fresh(auth: 'Auth', snapshot: Snapshot) -> bool:
+    """
+    Checks a snapshot against the server. A snapshot is fresh when the server holds the same
+    number of objects and none were updated after the newest object in the snapshot
+
+    :param auth: Auth object to use for authentication to the API
+    :param snapshot: The snapshot to check
+    """
+    metadata = snapshot.metadata
+    endpoint = metadata.get('endpoint')
+    if not endpoint:
+        raise NetkitError(message=f"{snapshot.path} does not record the endpoint it was taken of")
+    count = netbox_json(netbox_api(auth, endpoint, params={'limit': 1}))['count']
+    if count != metadata['count']:
+        return False
+    if not metadata.get('last_updated'):
+        return True
+    params = {'limit': 1, 'last_updated__gte': metadata['last_updated']}
+    recent = netbox_json(netbox_api(auth, endpoint, params=params))['count']
+    return recent == metadata['at_last_updated']
@@ -2,15 +2,19 @@
 Region is a base class which collects data relating to a region registered in Netkit
 """
 # Standard Library
-from typing import List, Union
+import threading
+from typing import Callable, Dict, Iterator, List, Union
 
 # Third Party
 import requests
 
 # First Party
 from netkit.auth import Auth
-from netkit.helpers.api import netbox_api
+from netkit.extras.watch import Watcher
+from netkit.helpers import profiling
+from netkit.helpers.api import netbox_api, netbox_json, netbox_results
 from netkit.helpers.exceptions import NetkitError
+from netkit.helpers.snapshot import Snapshot, dump_endpoint, is_fresh
 
 
 class Regions:
@@ -21,6 +25,9 @@ class Regions:
     def __init__(self, auth: Auth):
         self._auth = auth
         self._regions = None
+        self._snapshot = None
+        self._index = None
+        self._lock = threading.Lock()
 
     def __repr__(self):
         attrs = {
@@ -37,22 +44,145 @@ class Regions:
         return self._auth
 
     def _get_regions(self) -> requests.Response:
-        if self._regions is not None:
-            return self._regions
+        with self._lock:
+            # Once changes have been applied the index holds the regions
+            if self._regions is None and self._index is not None:
+                self._regions = list(self._index.values())
+            if self._regions is not None:
+                return self._regions
         result = netbox_api(self._auth, "/api/dcim/regions")
-        self._regions = result.json()['results']
-        return self._regions
+        regions = netbox_json(result)['results']
+        with self._lock:
+            self._regions = regions
+            self._index = None
+        return regions
+
+    def _get_index(self) -> dict:
+        # Must be called holding the lock, after the regions have been loaded
+        if self._index is None:
+            self._index = {region['id']: region for region in self._regions or []}
+        return self._index
 
     @property
+    @profiling.operation('list_regions')
     def list_regions(self) -> List['RegionInfo']:
         """
         A list of :class:`netkit.organization.regions.RegionInfo` objects representing regions
         """
+        regions = self._get_regions()
         try:
-            return [RegionInfo(region) for region in self._get_regions()]
+            with profiling.timed('wrap'):
+                return [RegionInfo(region) for region in regions]
         except TypeError:
             return []
 
+    def iter_regions(
+        self, page_size: int = None, deadline: float = None, params: dict = None, **filters
+    ) -> Iterator['RegionInfo']:
+        """
+        Yields :class:`netkit.organization.regions.RegionInfo` objects one page at a time, without
+        holding the full list of regions in memory
+
+        :param page_size: The number of regions requested per page
+        :param deadline: Total seconds allowed for requesting every page
+        :param params: NetBox filters given as a dictionary, for filter names which clash with
+            the arguments of this method
+        :param filters: Any NetBox filters to apply, such as ``status='active'``
+        """
+        params = dict(params or {}, **filters)
+        if page_size:
+            params['limit'] = page_size
+        for region in profiling.iterate(
+            'iter_regions',
+            netbox_results(self._auth, "/api/dcim/regions/", params=params, deadline=deadline),
+        ):
+            yield RegionInfo(region)
+
+    @profiling.operation('write_snapshot')
+    def write_snapshot(self, path: str) -> int:
+        """
+        Writes every region to a snapshot file which can be loaded with :meth:`load_snapshot`
+
+        :param path: The file to write
+        """
+        return dump_endpoint(self._auth, "/api/dcim/regions/", path)
+
+    def load_snapshot(self, path: str) -> Snapshot:
+        """
+        Loads regions from a snapshot file rather than the API. The file is memory-mapped
+        read-only, so it is shared by every process on the host loading the same snapshot
+
+        :param path: The snapshot file to load
+        """
+        self._snapshot = Snapshot(path)
+        with self._lock:
+            self._regions = self._snapshot
+            self._index = None
+        return self._snapshot
+
+    @profiling.operation('snapshot_is_fresh')
+    def snapshot_is_fresh(self) -> bool:
+        """
+        Whether the loaded snapshot still matches the regions held by the server
+        """
+        if self._snapshot is None:
+            raise NetkitError(message="No snapshot has been loaded")
+        return is_fresh(self._auth, self._snapshot)
+
+    def get_region(self, region_id: int) -> Union['RegionInfo', None]:
+        """
+        The :class:`netkit.organization.regions.RegionInfo` with the given ID, or None
+
+        :param region_id: The ID of the region
+        """
+        self._get_regions()
+        with self._lock:
+            region = self._get_index().get(region_id)
+        return RegionInfo(region) if region is not None else None
+
+    def apply_changes(self, updated: List[dict], deleted: List[int]):
+        """
+        Applies created or updated regions and removes deleted regions, as reported by a
+        :class:`netkit.extras.watch.Watcher`. Only the changed regions are touched, and the
+        list returned by :attr:`list_regions` is rebuilt from the index when next read
+
+        :param updated: The created or updated regions, as returned by the API
+        :param deleted: The IDs of the deleted regions
+        """
+        self._get_regions()
+        with self._lock:
+            index = self._get_index()
+            for region in updated:
+                index[region['id']] = region
+            for region_id in deleted:
+                index.pop(region_id, None)
+            self._regions = None
+        for obj_id in [obj['id'] for obj in updated] + list(deleted):
+            self._auth.identity_map.discard(RegionInfo, obj_id)
+
+    def watch(self, interval: float = 30.0, callback: Callable[[Dict], None] = None) -> Watcher:
+        """
+        Keeps the regions current by polling the NetBox change log in the background.
+        Call :meth:`netkit.extras.watch.Watcher.stop` on the returned watcher to stop
+
+        :param interval: Seconds between polls
+        :param callback: Called with each change once it has been applied
+        """
+        watcher = Watcher(self._auth, interval=interval)
+        watcher.track(self, "dcim.region", "/api/dcim/regions/")
+        # Record the change log position before loading, so changes made while the regions
+        # are loading are applied by the next poll rather than lost
+        watcher.poll()
+        regions = list(netbox_results(self._auth, "/api/dcim/regions/"))
+        with self._lock:
+            self._regions = regions
+            self._index = None
+        if callback is not None:
+            watcher.subscribe(callback)
+        watcher.start()
+        return watcher
+
+    @profiling.operation('create_region')
     def create_region(self, **kwargs) -> 'RegionInfo':
         """
         Creates a new region with supplied arguments.
@@ -60,7 +190,7 @@ class Regions:
         """
         try:
             result = netbox_api(self._auth, "/api/dcim/regions/", payload=kwargs, method="POST")
-            return RegionInfo(result.json())
+            return RegionInfo(netbox_json(result))
         except Exception as error:
             raise NetkitError(message=error)
 
@@ -82,6 +212,12 @@ class RegionInfo:
         }
         return "<{cls}: (at {at}) id={id!r} name={name!r}>".format(**attrs)
 
+    def as_json(self) -> dict:
+        """
+        The region represented as a JSON dictionary, as returned by the API
+        """
+        return dict(self._attributes)
+
     @property
     def id(self) -> int:
         """
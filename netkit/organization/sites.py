@@ -2,8 +2,9 @@
 Sites is a base class which collects data relating to sites registered in Netkit
 """
 # Standard Library
+import threading
 from datetime import datetime
-from typing import List, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Union
 
 # Third Party
 import requests
@@ -11,8 +12,20 @@ from pytz import timezone
 
 # First Party
 from netkit.auth import Auth
-from netkit.helpers.api import netbox_api
+from netkit.extras.watch import Watcher
+from netkit.helpers import profiling
+from netkit.helpers.api import netbox_api, netbox_json, netbox_results
 from netkit.helpers.exceptions import NetkitError
+from netkit.helpers.identity import resolve_related
+from netkit.helpers.snapshot import Snapshot, dump_endpoint, is_fresh
+from netkit.organization.regions import RegionInfo
+from netkit.tenancy.tenants import TenantInfo
+
+# The related objects which can be prefetched, with the endpoint and class used to resolve them
+RELATED = {
+    'region': ("/api/dcim/regions/", RegionInfo),
+    'tenant': ("/api/tenancy/tenants/", TenantInfo),
+}
 
 
 class Sites:
@@ -23,6 +36,9 @@ class Sites:
     def __init__(self, auth: Auth):
         self._auth = auth
         self._sites = None
+        self._snapshot = None
+        self._index = None
+        self._lock = threading.Lock()
 
     def __repr__(self):
         attrs = {
@@ -39,19 +55,177 @@ class Sites:
         return self._auth
 
     def _get_sites(self) -> requests.Response:
-        if self._sites is not None:
-            return self._sites
+        with self._lock:
+            # Once changes have been applied the index holds the sites
+            if self._sites is None and self._index is not None:
+                self._sites = list(self._index.values())
+            if self._sites is not None:
+                return self._sites
         result = netbox_api(self._auth, "/api/dcim/sites")
-        self._sites = result.json()['results']
-        return self._sites
+        sites = netbox_json(result)['results']
+        with self._lock:
+            self._sites = sites
+            self._index = None
+        return sites
+
+    def _get_index(self) -> dict:
+        # Must be called holding the lock, after the sites have been loaded
+        if self._index is None:
+            self._index = {site['id']: site for site in self._sites or []}
+        return self._index
 
     @property
+    @profiling.operation('list_sites')
     def list_sites(self) -> List['SiteInfo']:
         """
         A list of :class:`netkit.organization.sites.SiteInfo` objects representing sites
         """
-        return [SiteInfo(site) for site in self._get_sites()]
-
+        sites = self._get_sites()
+        with profiling.timed('wrap'):
+            return [SiteInfo(site) for site in sites]
+
+    def iter_sites(
+        self, page_size: int = None, deadline: float = None, params: dict = None, **filters
+    ) -> Iterator['SiteInfo']:
+        """
+        Yields :class:`netkit.organization.sites.SiteInfo` objects one page at a time, without
+        holding the full list of sites in memory
+
+        :param page_size: The number of sites requested per page
+        :param deadline: Total seconds allowed for requesting every page
+        :param params: NetBox filters given as a dictionary, for filter names which clash with
+            the arguments of this method
+        :param filters: Any NetBox filters to apply, such as ``status='active'``
+        """
+        params = dict(params or {}, **filters)
+        if page_size:
+            params['limit'] = page_size
+        for site in profiling.iterate(
+            'iter_sites',
+            netbox_results(self._auth, "/api/dcim/sites/", params=params, deadline=deadline),
+        ):
+            yield SiteInfo(site)
+
+    @profiling.operation('get_sites')
+    def get_sites(
+        self, prefetch_related: Iterable[str] = None, deadline: float = None, **filters
+    ) -> List['SiteInfo']:
+        """
+        A list of :class:`netkit.organization.sites.SiteInfo` objects matching the filters.
+        Related objects named in ``prefetch_related`` are fetched with one request per type and
+        made available on each site, such as :attr:`SiteInfo.region_info`
+
+        :param prefetch_related: The related objects to resolve, such as ``['region', 'tenant']``
+        :param deadline: Total seconds allowed for requesting every page of sites
+        :param filters: Any NetBox filters to apply, such as ``status='active'``
+        """
+        sites = list(
+            netbox_results(self._auth, "/api/dcim/sites/", params=filters, deadline=deadline)
+        )
+        related = {}
+        for name in prefetch_related or []:
+            if name not in RELATED:
+                raise NetkitError(
+                    message=f"Cannot prefetch {name!r}, choose from {sorted(RELATED)}"
+                )
+            path, kind = RELATED[name]
+            ids = [(site.get(name) or {}).get('id') for site in sites]
+            related[name] = resolve_related(self._auth, kind, path, ids)
+        with profiling.timed('wrap'):
+            return [
+                SiteInfo(
+                    site,
+                    related={
+                        name: objects.get((site.get(name) or {}).get('id'))
+                        for name, objects in related.items()
+                    },
+                )
+                for site in sites
+            ]
+
+    @profiling.operation('write_snapshot')
+    def write_snapshot(self, path: str) -> int:
+        """
+        Writes every site to a snapshot file which can be loaded with :meth:`load_snapshot`
+
+        :param path: The file to write
+        """
+        return dump_endpoint(self._auth, "/api/dcim/sites/", path)
+
+    def load_snapshot(self, path: str) -> Snapshot:
+        """
+        Loads sites from a snapshot file rather than the API. The file is memory-mapped
+        read-only, so it is shared by every process on the host loading the same snapshot
+
+        :param path: The snapshot file to load
+        """
+        self._snapshot = Snapshot(path)
+        with self._lock:
+            self._sites = self._snapshot
+            self._index = None
+        return self._snapshot
+
+    @profiling.operation('snapshot_is_fresh')
+    def snapshot_is_fresh(self) -> bool:
+        """
+        Whether the loaded snapshot still matches the sites held by the server
+        """
+        if self._snapshot is None:
+            raise NetkitError(message="No snapshot has been loaded")
+        return is_fresh(self._auth, self._snapshot)
+
+    def get_site(self, site_id: int) -> Union['SiteInfo', None]:
+        """
+        The :class:`netkit.organization.sites.SiteInfo` with the given ID, or None
+
+        :param site_id: The ID of the site
+        """
+        self._get_sites()
+        with self._lock:
+            site = self._get_index().get(site_id)
+        return SiteInfo(site) if site is not None else None
+
+    def apply_changes(self, updated: List[dict], deleted: List[int]):
+        """
+        Applies created or updated sites and removes deleted sites, as reported by a
+        :class:`netkit.extras.watch.Watcher`. Only the changed sites are touched, and the
+        list returned by :attr:`list_sites` is rebuilt from the index when next read
+
+        :param updated: The created or updated sites, as returned by the API
+        :param deleted: The IDs of the deleted sites
+        """
+        self._get_sites()
+        with self._lock:
+            index = self._get_index()
+            for site in updated:
+                index[site['id']] = site
+            for site_id in deleted:
+                index.pop(site_id, None)
+            self._sites = None
+
+    def watch(self, interval: float = 30.0, callback: Callable[[Dict], None] = None) -> Watcher:
+        """
+        Keeps the sites current by polling the NetBox change log in the background.
+        Call :meth:`netkit.extras.watch.Watcher.stop` on the returned watcher to stop
+
+        :param interval: Seconds between polls
+        :param callback: Called with each change once it has been applied
+        """
+        watcher = Watcher(self._auth, interval=interval)
+        watcher.track(self, "dcim.site", "/api/dcim/sites/")
+        # Record the change log position before loading, so changes made while the sites
+        # are loading are applied by the next poll rather than lost
+        watcher.poll()
+        sites = list(netbox_results(self._auth, "/api/dcim/sites/"))
+        with self._lock:
+            self._sites = sites
+            self._index = None
+        if callback is not None:
+            watcher.subscribe(callback)
+        watcher.start()
+        return watcher
+
+    @profiling.operation('create_site')
     def create_site(self, **kwargs) -> 'SiteInfo':
         """
         Creates a new site with supplied arguments.
@@ -59,7 +233,7 @@ class Sites:
         """
         try:
             result = netbox_api(self._auth, "/api/dcim/sites/", payload=kwargs, method="POST")
-            return SiteInfo(result.json())
+            return SiteInfo(netbox_json(result))
         except Exception as error:
             raise NetkitError(message=error)
 
@@ -69,8 +243,9 @@ class SiteInfo:
     Object representing a site
     """
 
-    def __init__(self, attributes):
+    def __init__(self, attributes, related: dict = None):
         self._attributes = attributes
+        self._related = related or {}
 
     def __repr__(self):
         attrs = {
@@ -81,6 +256,12 @@ class SiteInfo:
         }
         return "<{cls}: (at {at}) id={id!r} name={name!r}>".format(**attrs)
 
+    def as_json(self) -> dict:
+        """
+        The site represented as a JSON dictionary, as returned by the API
+        """
+        return dict(self._attributes)
+
     @property
     def id(self) -> int:
         """
@@ -116,6 +297,14 @@ class SiteInfo:
         """
         return self._attributes.get('region')
 
+    @property
+    def region_info(self) -> Union[RegionInfo, None]:
+        """
+        The :class:`netkit.organization.regions.RegionInfo` the site resides in, when the
+        region has been prefetched
+        """
+        return self._related.get('region')
+
     @property
     def tenant(self) -> Union[dict, None]:
         """
@@ -123,6 +312,14 @@ class SiteInfo:
         """
         return self._attributes.get('tenant')
 
+    @property
+    def tenant_info(self) -> Union[TenantInfo, None]:
+        """
+        The :class:`netkit.tenancy.tenants.TenantInfo` the site resides in, when the tenant
+        has been prefetched
+        """
+        return self._related.get('tenant')
+
     @property
     def facility(self) -> str:
         """
@@ -143,7 +340,8 @@ class SiteInfo:
         The time zone of the site
         """
         if self._attributes.get('time_zone'):
-            return timezone(self._attributes.get('time_zone'))
+            with profiling.timed('conversion', 'SiteInfo'):
+                return timezone(self._attributes.get('time_zone'))
         return None
 
     @property
@@ -228,7 +426,8 @@ class SiteInfo:
         """
         The date the site was created
         """
-        created_date = datetime.strptime(self._attributes.get('created'), '%Y-%m-%d')
+        with profiling.timed('conversion', 'SiteInfo'):
+            created_date = datetime.strptime(self._attributes.get('created'), '%Y-%m-%d')
         return created_date
 
     @property
@@ -236,9 +435,10 @@ class SiteInfo:
         """
         The date and time the site was last updated
         """
-        updated_time = datetime.strptime(
-            self._attributes.get('last_updated'), "%Y-%m-%dT%H:%M:%S.%fZ"
-        )
+        with profiling.timed('conversion', 'SiteInfo'):
+            updated_time = datetime.strptime(
+                self._attributes.get('last_updated'), "%Y-%m-%dT%H:%M:%S.%fZ"
+            )
         return updated_time
 
     @property
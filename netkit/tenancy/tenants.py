@@ -0,0 +1,126 @@
+"""
+Tenants is a base class which collects data relating to tenants registered in Netkit
+"""
+# Standard Library
+from typing import Iterator, List, Union
+
+# First Party
+from netkit.auth import Auth
+from netkit.helpers import profiling
+from netkit.helpers.api import netbox_results
+
+
+class Tenants:
+    """
+    :param auth: Auth object used for authenting to the API
+    """
+
+    def __init__(self, auth: Auth):
+        self._auth = auth
+        self._tenants = None
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+        }
+        return "<{cls}: (at {at})>".format(**attrs)
+
+    @property
+    def auth(self) -> Auth:
+        """
+        The :class:`netkit.auth.Auth` object used to authenticate to the instance
+        """
+        return self._auth
+
+    @property
+    @profiling.operation('list_tenants')
+    def list_tenants(self) -> List['TenantInfo']:
+        """
+        A list of :class:`netkit.tenancy.tenants.TenantInfo` objects representing tenants
+        """
+        if self._tenants is None:
+            self._tenants = list(netbox_results(self._auth, "/api/tenancy/tenants/"))
+        with profiling.timed('wrap'):
+            return [TenantInfo(tenant) for tenant in self._tenants]
+
+    def iter_tenants(
+        self, page_size: int = None, deadline: float = None, params: dict = None, **filters
+    ) -> Iterator['TenantInfo']:
+        """
+        Yields :class:`netkit.tenancy.tenants.TenantInfo` objects one page at a time, without
+        holding the full list of tenants in memory
+
+        :param page_size: The number of tenants requested per page
+        :param deadline: Total seconds allowed for requesting every page
+        :param params: NetBox filters given as a dictionary, for filter names which clash with
+            the arguments of this method
+        :param filters: Any NetBox filters to apply, such as ``group='customers'``
+        """
+        params = dict(params or {}, **filters)
+        if page_size:
+            params['limit'] = page_size
+        for tenant in profiling.iterate(
+            'iter_tenants',
+            netbox_results(self._auth, "/api/tenancy/tenants/", params=params, deadline=deadline),
+        ):
+            yield TenantInfo(tenant)
+
+
+class TenantInfo:
+    """
+    Object representing a tenant
+    """
+
+    def __init__(self, attributes):
+        self._attributes = attributes
+
+    def __repr__(self):
+        attrs = {
+            "cls": self.__class__.__name__,
+            "at": hex(id(self)),
+            "id": self.id,
+            "name": self.name,
+        }
+        return "<{cls}: (at {at}) id={id!r} name={name!r}>".format(**attrs)
+
+    def as_json(self) -> dict:
+        """
+        The tenant represented as a JSON dictionary, as returned by the API
+        """
+        return dict(self._attributes)
+
+    @property
+    def id(self) -> int:
+        """
+        The ID of the registered tenant
+        """
+        return self._attributes.get('id')
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the registered tenant
+        """
+        return self._attributes.get('name')
+
+    @property
+    def slug(self) -> str:
+        """
+        The slug associated with the registered tenant
+        """
+        return self._attributes.get('slug')
+
+    @property
+    def group(self) -> Union[dict, None]:
+        """
+        The tenant group the tenant belongs to
+        """
+        return self._attributes.get('group')
+
+    @property
+    def description(self) -> str:
+        """
+        The description for the tenant
+        """
+        return self._attributes.get('description')
@@ -21,6 +21,7 @@ def run_setup():
             "Operating System :: OS Independent",
         ],
         install_requires=["requests"],
+        entry_points={"console_scripts": ["netkit=netkit.cli:main"]},
         python_requires='!=2.*,>=3.7',
     )
 
@@ -3,14 +3,18 @@ Tests Netkit.Auth Class
 """
 # Standard Library
 import json
+import time
 import unittest
 from os import path
+from unittest import mock
 
 # Third Party
 import requests_mock
 
 # First Party
 from netkit.auth import Auth
+from netkit.helpers.api import netbox_api
+from netkit.helpers.exceptions import NetkitTimeoutError
 
 
 def fake_api(*args, **kwargs):
@@ -45,3 +49,68 @@ class NetkitAuthTest(unittest.TestCase):
         self.assertEqual(auth.token, 'foo')
         self.assertEqual(auth.url, 'https://netkit.example.com')
         self.assertTrue(auth.is_valid())
+
+    @requests_mock.mock()
+    def test_auth_timeouts(self, mock_requests):
+        """
+        Tests the connect and read timeouts are passed to each request, capped by the deadline
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=fake_api
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com', read_timeout=30)
+        netbox_api(auth, "/api/dcim/sites")
+        self.assertEqual(mock_requests.request_history[0].timeout, (10.0, 30))
+
+        netbox_api(auth, "/api/dcim/sites", deadline=5)
+        connect_timeout, read_timeout = mock_requests.request_history[1].timeout
+        self.assertLessEqual(connect_timeout, 5)
+        self.assertLessEqual(read_timeout, 5)
+
+    @requests_mock.mock()
+    def test_auth_deadline(self, mock_requests):
+        """
+        Tests a request still running when the deadline passes raises NetkitTimeoutError
+        """
+
+        def slow_api(*args, **kwargs):
+            time.sleep(0.3)
+            return fake_api()
+
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=slow_api
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com', deadline=0.05)
+        with self.assertRaises(NetkitTimeoutError):
+            netbox_api(auth, "/api/dcim/sites")
+        self.assertEqual(auth.request_stats['timeouts'], 1)
+
+    def test_auth_hedged_requests(self):
+        """
+        Tests a slow GET is hedged once enough latencies are recorded, and that the hedge
+        answering first is counted as a win
+        """
+        hedge = mock.Mock()
+        calls = []
+
+        def first_call_slow(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                time.sleep(0.3)
+                return mock.Mock()
+            return hedge
+
+        auth = Auth(token='foo', url='https://netkit.example.com', hedge_percentile=50)
+        self.assertIsNone(auth.hedge_delay)
+        for _ in range(Auth.HEDGE_MIN_SAMPLES):
+            auth.record_latency(0.01)
+        self.assertEqual(auth.hedge_delay, 0.01)
+
+        with mock.patch('netkit.helpers.api.requests.request', side_effect=first_call_slow):
+            response = netbox_api(auth, "/api/dcim/sites")
+        self.assertIs(response, hedge)
+        self.assertEqual(auth.request_stats['hedges'], 1)
+        self.assertEqual(auth.request_stats['hedge_wins'], 1)
+        self.assertEqual(auth.request_stats['requests'], 2)
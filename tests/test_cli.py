@@ -0,0 +1,140 @@
+"""
+Tests Netkit.cli
+"""
+# Standard Library
+import csv
+import io
+import json
+import os
+import unittest
+from os import path
+from unittest import mock
+
+# Third Party
+import requests_mock
+
+# First Party
+from netkit.cli import main
+
+
+def fake_api(*args, **kwargs):
+    """
+    Creates the fake api result for mocking later
+    """
+    basepath = path.dirname(__file__)
+    filepath = path.abspath(path.join(basepath, "assets/sites/sites_list.json"))
+    with open(filepath, "r") as fp:
+        return json.load(fp)
+
+
+def paged_api(request, context):
+    """
+    Splits the site asset into two pages, linked by the next url
+    """
+    page = fake_api()
+    site = page['results'][0]
+    if request.qs.get('offset') == ['1']:
+        second = dict(site, id=2, name='Netkit Lab Two', slug='netkit-lab-two')
+        return dict(page, count=2, next=None, results=[second])
+    page['count'] = 2
+    page['next'] = "http://netkit.example.com/api/dcim/sites/?limit=1&offset=1"
+    return page
+
+
+class NetkitCliTest(unittest.TestCase):
+    """
+    A collection of tests to check the netkit command line interface
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NetkitCliTest, self).__init__(*args, **kwargs)
+
+    def _run(self, *argv):
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            status = main(
+                ['--url', 'https://netkit.example.com', '--token', 'foo', 'export', *argv]
+            )
+        self.assertEqual(status, 0)
+        return stdout.getvalue()
+
+    @requests_mock.mock()
+    def test_export_ndjson(self, mock_requests):
+        """
+        Tests every page is exported, with one JSON object per line
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=paged_api
+        )
+
+        lines = self._run('sites', '--page-size', '1').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(
+            [json.loads(line)['slug'] for line in lines], ['netkit-lab', 'netkit-lab-two']
+        )
+        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(mock_requests.request_history[0].qs, {'limit': ['1']})
+
+    @requests_mock.mock()
+    def test_export_csv_fields_and_filters(self, mock_requests):
+        """
+        Tests field selection, dotted field names and filters when exporting as CSV
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=paged_api
+        )
+
+        output = self._run(
+            'sites',
+            '--format',
+            'csv',
+            '--fields',
+            'id,name,region.slug',
+            '--filter',
+            'status=active',
+        )
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0], {'id': '1', 'name': 'Netkit Lab', 'region.slug': 'region-one'})
+        self.assertEqual(mock_requests.request_history[0].qs, {'status': ['active']})
+
+    def test_export_requires_credentials(self):
+        """
+        Tests a missing url or token is reported rather than raised
+        """
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            self.assertEqual(main(['--url', '', '--token', '', 'export', 'sites']), 1)
+        self.assertIn('--url and --token', stderr.getvalue())
+
+    @requests_mock.mock()
+    def test_export_filter_names_clashing_with_arguments(self, mock_requests):
+        """
+        Tests filters named like method arguments are sent to NetBox as filters
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=paged_api
+        )
+
+        self._run('sites', '--filter', 'page_size=5', '--filter', 'deadline=5')
+        self.assertEqual(
+            mock_requests.request_history[0].qs, {'page_size': ['5'], 'deadline': ['5']}
+        )
+
+    @requests_mock.mock()
+    def test_export_broken_pipe(self, mock_requests):
+        """
+        Tests a reader closing the pipe early exits quietly
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=paged_api
+        )
+
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        with open(write_fd, 'w') as stdout, mock.patch('sys.stdout', stdout), mock.patch(
+            'sys.stderr', new_callable=io.StringIO
+        ) as stderr:
+            status = main(
+                ['--url', 'https://netkit.example.com', '--token', 'foo', 'export', 'sites']
+            )
+        self.assertEqual(status, 1)
+        self.assertEqual(stderr.getvalue(), '')
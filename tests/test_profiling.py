@@ -0,0 +1,124 @@
+"""
+Tests Netkit.helpers.profiling
+"""
+# Standard Library
+import io
+import json
+import unittest
+from os import path
+from unittest import mock
+
+# Third Party
+import requests_mock
+
+# First Party
+from netkit.auth import Auth
+from netkit.cli import main
+from netkit.helpers import profiling
+from netkit.organization.sites import Sites
+
+
+def fake_api(*args, **kwargs):
+    """
+    Creates the fake api result for mocking later
+    """
+    basepath = path.dirname(__file__)
+    filepath = path.abspath(path.join(basepath, "assets/sites/sites_list.json"))
+    with open(filepath, "r") as fp:
+        return json.load(fp)
+
+
+class NetkitProfilingTest(unittest.TestCase):
+    """
+    A collection of tests to check the Netkit.helpers.profiling module
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NetkitProfilingTest, self).__init__(*args, **kwargs)
+
+    @requests_mock.mock()
+    def test_profile_phases(self, mock_requests):
+        """
+        Tests each phase of listing sites is recorded under the operation, and that a report
+        is written when the profile ends
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=fake_api
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        stream = io.StringIO()
+        with profiling.profile(stream=stream) as report:
+            site_one = Sites(auth).list_sites[0]
+            self.assertEqual(site_one.time_zone.zone, 'Europe/London')
+            self.assertEqual(site_one.created.year, 2019)
+
+        timings = report.timings
+        for phase in ('connect', 'transfer', 'decode', 'wrap'):
+            self.assertEqual(timings[('list_sites', phase)][0], 1)
+        self.assertEqual(timings[('SiteInfo', 'conversion')][0], 2)
+        self.assertIn('list_sites', stream.getvalue())
+        self.assertFalse(profiling.enabled())
+
+    @requests_mock.mock()
+    def test_profile_iter_sites(self, mock_requests):
+        """
+        Tests every page of iter_sites is recorded under a single operation, and that the
+        operation is not left running while the caller handles each site
+        """
+        site = fake_api()['results'][0]
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/sites/",
+            json=lambda request, context: (
+                {'next': None, 'results': [dict(site, id=2)]}
+                if request.qs.get('offset')
+                else {
+                    'next': "https://netkit.example.com/api/dcim/sites/?limit=1&offset=1",
+                    'results': [site],
+                }
+            ),
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        with profiling.profile() as report:
+            for _ in Sites(auth).iter_sites(page_size=1):
+                self.assertIsNone(profiling.current_operation())
+
+        self.assertEqual(
+            sorted(report.timings),
+            [('iter_sites', 'connect'), ('iter_sites', 'decode'), ('iter_sites', 'transfer')],
+        )
+        self.assertEqual(report.timings[('iter_sites', 'decode')][0], 2)
+
+    @requests_mock.mock()
+    def test_cli_profiling_is_opt_in(self, mock_requests):
+        """
+        Tests the command line only profiles when --profile is given
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=fake_api
+        )
+        seen = []
+        mock_requests.add_matcher(lambda request: seen.append(profiling.enabled()))
+
+        argv = ['--url', 'https://netkit.example.com', '--token', 'foo']
+        with mock.patch('sys.stdout', new_callable=io.StringIO), mock.patch(
+            'sys.stderr', new_callable=io.StringIO
+        ) as stderr:
+            main(argv + ['export', 'sites'])
+            self.assertEqual(stderr.getvalue(), '')
+            main(argv + ['--profile', 'export', 'sites'])
+        self.assertEqual(seen, [False, True])
+        self.assertIn('export sites', stderr.getvalue())
+
+    def test_profile_disabled(self):
+        """
+        Tests nothing is recorded outside of a profile
+        """
+        with profiling.timed('decode') as timer:
+            pass
+        self.assertIs(timer, profiling.timed('wrap'))
+        with profiling.profile() as report:
+            pass
+        self.assertEqual(report.timings, {})
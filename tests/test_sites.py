@@ -3,14 +3,18 @@ Tests Netkit.Sites Class
 """
 # Standard Library
 import json
+import os
+import tempfile
 import unittest
 from os import path
+from unittest import mock
 
 # Third Party
 import requests_mock
 
 # First Party
 from netkit.auth import Auth
+from netkit.helpers.api import netbox_results_by_id
 from netkit.organization.sites import Sites
 
 
@@ -58,3 +62,98 @@ class NetkitSitesTest(unittest.TestCase):
         self.assertFalse(site_one.tags)
         self.assertIsNone(site_one.circuit_count)
         self.assertIsNone(site_one.vlan_count)
+
+    @requests_mock.mock()
+    def test_sites_prefetch_related(self, mock_requests):
+        """
+        Tests related regions and tenants are resolved with a single request per type, and
+        that objects already held in the identity map are not requested again
+        """
+        sites_page = fake_api()
+        site = sites_page['results'][0]
+        sites_page['results'].append(dict(site, id=2, name='Netkit Lab Two'))
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=sites_page
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/regions/",
+            json={'next': None, 'results': [{'id': 1, 'name': 'Region One'}]},
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/tenancy/tenants/",
+            json={'next': None, 'results': [{'id': 1, 'name': 'Tenant One'}]},
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        sites = Sites(auth).get_sites(prefetch_related=['region', 'tenant'])
+        self.assertEqual(len(sites), 2)
+        self.assertEqual(sites[0].region_info.name, 'Region One')
+        self.assertIs(sites[0].region_info, sites[1].region_info)
+        self.assertEqual(sites[1].tenant_info.name, 'Tenant One')
+        self.assertEqual(mock_requests.call_count, 3)
+        self.assertEqual(mock_requests.request_history[1].qs, {'id__in': ['1'], 'limit': ['1']})
+
+        Sites(auth).get_sites(prefetch_related=['region'])
+        self.assertEqual(mock_requests.call_count, 4)
+        self.assertIsNone(Sites(auth).get_sites()[0].region_info)
+
+    @requests_mock.mock()
+    def test_sites_snapshot(self, mock_requests):
+        """
+        Tests sites loaded from a snapshot file match those returned by the API, and that the
+        snapshot is only fresh while the server holds the same sites
+        """
+        sites_page = fake_api()
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites/", json=sites_page
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = path.join(directory, 'sites.snapshot')
+            self.assertEqual(Sites(auth).write_snapshot(snapshot_path), 1)
+
+            sites = Sites(auth)
+            snapshot = sites.load_snapshot(snapshot_path)
+            site_one = sites.list_sites[0]
+            self.assertEqual(mock_requests.call_count, 1)
+            self.assertEqual(site_one.as_json(), sites_page['results'][0])
+            self.assertEqual(site_one.asn, 12200)
+            self.assertEqual(site_one.region['slug'], 'region-one')
+            self.assertEqual(site_one.time_zone.zone, 'Europe/London')
+            self.assertEqual(site_one.created.year, 2019)
+            self.assertIsNone(site_one.circuit_count)
+
+            self.assertTrue(sites.snapshot_is_fresh())
+            self.assertIn('last_updated__gte', mock_requests.last_request.qs)
+            sites_page['count'] = 2
+            self.assertFalse(sites.snapshot_is_fresh())
+            snapshot.close()
+
+            with mock.patch('netkit.helpers.snapshot.os.replace', side_effect=OSError):
+                with self.assertRaises(OSError):
+                    Sites(auth).write_snapshot(snapshot_path)
+            self.assertEqual(os.listdir(directory), ['sites.snapshot'])
+
+    @requests_mock.mock()
+    def test_results_by_id_chunks(self, mock_requests):
+        """
+        Tests IDs are split across requests so the id__in filter stays short
+        """
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/regions/",
+            json=lambda request, context: {
+                'next': None,
+                'results': [{'id': int(obj_id)} for obj_id in request.qs['id__in'][0].split(',')],
+            },
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        results = netbox_results_by_id(auth, "/api/dcim/regions/", [1, 2, 3], chunk_size=2)
+        self.assertEqual([obj['id'] for obj in results], [1, 2, 3])
+        self.assertEqual(
+            [request.qs['id__in'] for request in mock_requests.request_history], [['1,2'], ['3']]
+        )
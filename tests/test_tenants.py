@@ -0,0 +1,53 @@
+"""
+Tests Netkit.Tenants Class
+"""
+# Standard Library
+import json
+import unittest
+from os import path
+
+# Third Party
+import requests_mock
+
+# First Party
+from netkit.auth import Auth
+from netkit.tenancy.tenants import Tenants
+
+
+def fake_api(*args, **kwargs):
+    """
+    Creates the fake api result for mocking later
+    """
+    basepath = path.dirname(__file__)
+    filepath = path.abspath(path.join(basepath, "assets/tenants/tenants_list.json"))
+    with open(filepath, "r") as fp:
+        return json.load(fp)
+
+
+class NetkitTenantsTest(unittest.TestCase):
+    """
+    A collection of tests to check the Netkit.tenancy.tenants.Tenants class
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NetkitTenantsTest, self).__init__(*args, **kwargs)
+
+    @requests_mock.mock()
+    def test_tenants_properties(self, mock_requests):
+        """
+        Tests the properties returned by the Netkit.tenancy.tenants.Tenants class by mocking
+        against an asset file containing a valid JSON response
+        """
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/tenancy/tenants/", json=fake_api
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        tenants = Tenants(auth)
+        tenant_one = tenants.list_tenants[0]
+        self.assertEqual(tenant_one.id, 1)
+        self.assertIsInstance(tenant_one.id, int)
+        self.assertEqual(tenant_one.name, 'Tenant One')
+        self.assertEqual(tenant_one.slug, 'tenant-one')
+        self.assertIsNone(tenant_one.group)
+        self.assertEqual(tenant_one.description, '')
@@ -0,0 +1,265 @@
+"""
+Tests Netkit.extras.watch.Watcher Class
+"""
+# Standard Library
+import json
+import unittest
+from os import path
+
+# Third Party
+import requests_mock
+
+# First Party
+from netkit.auth import Auth
+from netkit.extras.watch import Watcher
+from netkit.organization.regions import Regions
+from netkit.organization.sites import Sites
+
+
+def fake_api(*args, **kwargs):
+    """
+    Creates the fake api result for mocking later
+    """
+    basepath = path.dirname(__file__)
+    filepath = path.abspath(path.join(basepath, "assets/sites/sites_list.json"))
+    with open(filepath, "r") as fp:
+        return json.load(fp)
+
+
+class NetkitWatcherTest(unittest.TestCase):
+    """
+    A collection of tests to check the Netkit.extras.watch.Watcher class
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NetkitWatcherTest, self).__init__(*args, **kwargs)
+
+    @requests_mock.mock()
+    def test_watcher_applies_changes(self, mock_requests):
+        """
+        Tests creates, updates and deletes from the change log are applied to the tracked
+        sites, that only changed sites are requested and that subscribers are notified
+        """
+        sites_page = fake_api()
+        site = sites_page['results'][0]
+        sites_page['results'].append(dict(site, id=2, name='Netkit Lab Two'))
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=sites_page
+        )
+
+        def object_changes(request, context):
+            if 'id__gt' not in request.qs:
+                return {'next': None, 'results': [{'id': 10}]}
+            return {
+                'next': None,
+                'results': [
+                    {'id': 13, 'action': {'value': 'create'}, 'changed_object_id': 3},
+                    {'id': 12, 'action': {'value': 'delete'}, 'changed_object_id': 2},
+                    {'id': 11, 'action': {'value': 'update'}, 'changed_object_id': 1},
+                ],
+            }
+
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/extras/object-changes/", json=object_changes
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/sites/",
+            json={
+                'next': None,
+                'results': [dict(site, name='Netkit Lab Renamed'), dict(site, id=3, name='New')],
+            },
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        sites = Sites(auth)
+        self.assertEqual(len(sites.list_sites), 2)
+
+        watcher = Watcher(auth)
+        watcher.track(sites, 'dcim.site', '/api/dcim/sites/')
+        received = []
+
+        def failing_callback(change):
+            raise RuntimeError("subscriber failed")
+
+        watcher.subscribe(failing_callback)
+        watcher.subscribe(received.append)
+        self.assertEqual(watcher.poll(), [])
+
+        changes = watcher.poll()
+        self.assertEqual(
+            [(change['action'], change['id']) for change in changes],
+            [('update', 1), ('delete', 2), ('create', 3)],
+        )
+        self.assertEqual(received, changes)
+        self.assertEqual(
+            mock_requests.request_history[-2].qs,
+            {'changed_object_type': ['dcim.site'], 'id__gt': ['0']},
+        )
+        self.assertEqual(mock_requests.last_request.qs, {'id__in': ['1,3'], 'limit': ['2']})
+        self.assertEqual([site.name for site in sites.list_sites], ['Netkit Lab Renamed', 'New'])
+        self.assertIsNone(sites.get_site(2))
+        self.assertEqual(sites.get_site(3).name, 'New')
+
+    @requests_mock.mock()
+    def test_watcher_keeps_a_cursor_per_type(self, mock_requests):
+        """
+        Tests a change logged for one tracked type while another type is being requested is
+        applied by the next poll, rather than skipped by a cursor shared between the types
+        """
+        site = fake_api()['results'][0]
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=fake_api()
+        )
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/regions", json={'next': None, 'results': []}
+        )
+        logged = [{'id': 10, 'changed_object_type': 'dcim.site'}]
+
+        def object_changes(request, context):
+            object_type = request.qs['changed_object_type'][0]
+            after = int(request.qs.get('id__gt', ['0'])[0])
+            results = [
+                change
+                for change in logged
+                if change['changed_object_type'] == object_type and change['id'] > after
+            ]
+            if 'id__gt' in request.qs and object_type == 'dcim.site':
+                # Both changes are logged after the sites were requested but before the regions
+                logged.extend(
+                    [
+                        {
+                            'id': 11,
+                            'changed_object_type': 'dcim.site',
+                            'action': {'value': 'update'},
+                            'changed_object_id': 1,
+                        },
+                        {
+                            'id': 12,
+                            'changed_object_type': 'dcim.region',
+                            'action': {'value': 'delete'},
+                            'changed_object_id': 7,
+                        },
+                    ]
+                )
+            return {'next': None, 'results': sorted(results, key=lambda change: -change['id'])}
+
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/extras/object-changes/", json=object_changes
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/sites/",
+            json={'next': None, 'results': [dict(site, name='Netkit Lab Renamed')]},
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/regions/",
+            json={'next': None, 'results': []},
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        sites = Sites(auth)
+        regions = Regions(auth)
+        self.assertEqual(sites.list_sites[0].name, 'Netkit Lab')
+        self.assertEqual(regions.list_regions, [])
+
+        watcher = Watcher(auth)
+        watcher.track(sites, 'dcim.site', '/api/dcim/sites/')
+        watcher.track(regions, 'dcim.region', '/api/dcim/regions/')
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(
+            [(change['type'], change['id']) for change in watcher.poll()], [('dcim.region', 7)]
+        )
+        self.assertEqual(
+            [(change['type'], change['id']) for change in watcher.poll()], [('dcim.site', 1)]
+        )
+        self.assertEqual(sites.get_site(1).name, 'Netkit Lab Renamed')
+
+    @requests_mock.mock()
+    def test_watcher_applies_changes_committed_out_of_order(self, mock_requests):
+        """
+        Tests a change which becomes visible after a change with a higher id is applied by the
+        next poll, and that changes already applied are not applied again
+        """
+        site = fake_api()['results'][0]
+        sites_page = fake_api()
+        sites_page['results'].append(dict(site, id=2, name='Netkit Lab Two'))
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/dcim/sites", json=sites_page
+        )
+        logged = [{'id': 150}]
+
+        def object_changes(request, context):
+            after = int(request.qs.get('id__gt', ['0'])[0])
+            results = [change for change in logged if change['id'] > after]
+            return {'next': None, 'results': sorted(results, key=lambda change: -change['id'])}
+
+        mock_requests.register_uri(
+            "GET", "https://netkit.example.com/api/extras/object-changes/", json=object_changes
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/sites/",
+            json=lambda request, context: {
+                'next': None,
+                'results': [
+                    dict(site, id=int(obj_id), name=f'Renamed {obj_id}')
+                    for obj_id in request.qs['id__in'][0].split(',')
+                ],
+            },
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        sites = Sites(auth)
+        self.assertEqual(len(sites.list_sites), 2)
+        watcher = Watcher(auth)
+        watcher.track(sites, 'dcim.site', '/api/dcim/sites/')
+        self.assertEqual(watcher.poll(), [])
+
+        # Change 160 commits before change 155, which is only visible after the next poll
+        logged.append({'id': 160, 'action': {'value': 'update'}, 'changed_object_id': 1})
+        self.assertEqual([change['id'] for change in watcher.poll()], [1])
+        logged.append({'id': 155, 'action': {'value': 'update'}, 'changed_object_id': 2})
+        self.assertEqual([change['id'] for change in watcher.poll()], [2])
+        self.assertEqual(
+            mock_requests.request_history[-2].qs,
+            {'changed_object_type': ['dcim.site'], 'id__gt': ['60']},
+        )
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual([site.name for site in sites.list_sites], ['Renamed 1', 'Renamed 2'])
+
+    @requests_mock.mock()
+    def test_watch_records_cursor_before_loading(self, mock_requests):
+        """
+        Tests watch records the change log position before loading every page of sites
+        """
+        site = fake_api()['results'][0]
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/extras/object-changes/",
+            json={'next': None, 'results': [{'id': 10}]},
+        )
+        mock_requests.register_uri(
+            "GET",
+            "https://netkit.example.com/api/dcim/sites/",
+            json=lambda request, context: (
+                {'next': None, 'results': [dict(site, id=2)]}
+                if request.qs.get('offset')
+                else {
+                    'next': "https://netkit.example.com/api/dcim/sites/?offset=1",
+                    'results': [site],
+                }
+            ),
+        )
+
+        auth = Auth(token='foo', url='https://netkit.example.com')
+        sites = Sites(auth)
+        watcher = sites.watch(interval=60)
+        watcher.stop()
+        self.assertEqual(
+            [request.path for request in mock_requests.request_history],
+            ['/api/extras/object-changes/', '/api/dcim/sites/', '/api/dcim/sites/'],
+        )
+        self.assertEqual([site.id for site in sites.list_sites], [1, 2])
+        self.assertEqual(sites.get_site(2).id, 2)